@@ -1,11 +1,10 @@
 # led_wall_estimator_profit.py
 # Streamlit app: LED Video Wall Estimator (RSI markup + Branding version)
 
-import math
-import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.graph_objects as go
+
+from ledcore import AREA_PER_CAB, CABINET_H, CABINET_W, estimate, money
 
 # -------------------------------------------------
 # Page setup
@@ -38,6 +37,15 @@ st.markdown(
             border-bottom: 2px solid #00408020;
             margin-bottom: 10px;
         }
+        table.specs {
+            width: 100%;
+            border-collapse: collapse;
+        }
+        table.specs th, table.specs td {
+            text-align: left;
+            padding: 4px 8px;
+            border-bottom: 1px solid #00408020;
+        }
     </style>
     """,
     unsafe_allow_html=True,
@@ -66,79 +74,25 @@ st.markdown(
 # -------------------------------------------------
 # Helpers
 # -------------------------------------------------
-def linear_price_per_m2(qty: int, low_qty=1, low_price=3400.0, high_qty=25, high_price=2720.0):
-    """Linear interpolation between 1-unit and 25-unit pricing tiers."""
-    if qty <= low_qty:
-        return float(low_price)
-    if qty >= high_qty:
-        return float(high_price)
-    frac = (qty - low_qty) / (high_qty - low_qty)
-    return float(low_price + frac * (high_price - low_price))
-
-def compute_costs(cols, rows, qty, price_mode, custom_price_m2, controller_cost, markup_pct):
-    cabinet_w = 0.5
-    cabinet_h = 0.5
-    area_per_cab = cabinet_w * cabinet_h
-    cabinets = int(cols * rows)
-    area_m2 = cabinets * area_per_cab
-
-    # Base pricing logic
-    if price_mode == "Tiered (linear 1→25)":
-        base_price_m2 = linear_price_per_m2(qty)
-    else:
-        base_price_m2 = float(custom_price_m2)
-
-    base_hardware = area_m2 * base_price_m2
-    controller_total = controller_cost
-
-    subtotal = base_hardware + controller_total
-    markup_amount = subtotal * (markup_pct / 100.0)
-    grand_total = subtotal + markup_amount
-
-    per_m2 = grand_total / area_m2 if area_m2 > 0 else 0.0
-    per_cab = grand_total / cabinets if cabinets > 0 else 0.0
-    order_total = grand_total * qty
-
-    return {
-        "area_m2": area_m2,
-        "cabinets": cabinets,
-        "width_m": cols * cabinet_w,
-        "height_m": rows * cabinet_h,
-        "base_price_m2": base_price_m2,
-        "base_hardware": base_hardware,
-        "controller_total": controller_total,
-        "markup_pct": markup_pct,
-        "markup_amount": markup_amount,
-        "grand_total": grand_total,
-        "per_m2": per_m2,
-        "per_cabinet": per_cab,
-        "order_total": order_total,
-    }
-
-def grid_figure(cols, rows):
-    """Draws the cabinet grid preview."""
-    cabinet_w = 0.5
-    cabinet_h = 0.5
-    width_m = cols * cabinet_w
-    height_m = rows * cabinet_h
-
-    fig = go.Figure()
-    fig.add_shape(type="rect", x0=0, y0=0, x1=width_m, y1=height_m, line=dict(width=2))
-    for c in range(1, cols):
-        x = c * cabinet_w
-        fig.add_shape(type="line", x0=x, y0=0, x1=x, y1=height_m, line=dict(width=1))
-    for r in range(1, rows):
-        y = r * cabinet_h
-        fig.add_shape(type="line", x0=0, y0=y, x1=width_m, y1=y, line=dict(width=1))
-
-    fig.update_xaxes(range=[-0.05, width_m + 0.05], title_text="Width (m)", showgrid=False, zeroline=False)
-    fig.update_yaxes(range=[-0.05, height_m + 0.05], title_text="Height (m)", scaleanchor="x",
-                     scaleratio=1, showgrid=False, zeroline=False)
-    fig.update_layout(margin=dict(l=10, r=10, t=10, b=10), height=420, dragmode=False)
-    return fig
-
-def money(x):
-    return f"${x:,.0f}"
+@st.cache_data(max_entries=256)
+def specs_html(result_items, qty):
+    r = dict(result_items)
+    return pd.DataFrame.from_records([
+        ("Width (m)", f"{r['width_m']:.2f}"),
+        ("Height (m)", f"{r['height_m']:.2f}"),
+        ("Area (m²)", f"{r['area_m2']:.2f}"),
+        ("Cabinets", f"{r['cabinets']}"),
+        ("Per-m² base price", money(r["base_price_m2"])),
+        ("Panels base $", money(r["base_hardware"])),
+        ("Controller $", money(r["controller_total"])),
+        ("RSI Markup %", f"{r['markup_pct']}%"),
+        ("RSI Markup $", money(r["markup_amount"])),
+        ("Total per screen $", money(r["grand_total"])),
+        ("Per m² all-in $", money(r["per_m2"])),
+        ("Per cabinet all-in $", money(r["per_cabinet"])),
+        ("Order qty", f"{qty}"),
+        ("Order total $", money(r["order_total"])),
+    ], columns=["Metric", "Value"]).to_html(index=False, classes="specs")
 
 # -------------------------------------------------
 # Sidebar Controls
@@ -171,15 +125,14 @@ with left:
     rows = st.slider("Rows (0.5 m increments)", min_value=1, max_value=20, value=3, step=1)
 
     st.write("Each cabinet is 0.5 m × 0.5 m. Drag sliders to simulate resizing in 0.25 m² increments.")
-    fig = grid_figure(cols, rows)
+    result, fig = estimate(cols, rows, qty, price_mode, custom_price_m2, controller_cost, markup_pct)
     st.plotly_chart(fig, use_container_width=True)
 
 with right:
     st.subheader("Specs")
-    cabinet_w, cabinet_h = 0.5, 0.5
-    width_m = cols * cabinet_w
-    height_m = rows * cabinet_h
-    area_m2 = cols * rows * cabinet_w * cabinet_h
+    width_m = cols * CABINET_W
+    height_m = rows * CABINET_H
+    area_m2 = cols * rows * AREA_PER_CAB
     cabinets = cols * rows
 
     st.metric("Width (m)", f"{width_m:.2f}")
@@ -187,8 +140,6 @@ with right:
     st.metric("Area (m²)", f"{area_m2:.2f}")
     st.metric("Cabinets", f"{cabinets}")
 
-    result = compute_costs(cols, rows, qty, price_mode, custom_price_m2, controller_cost, markup_pct)
-
     st.subheader("Pricing Breakdown")
     st.write(f"Per-m² base price: **{money(result['base_price_m2'])}**")
     st.write(f"Base hardware: **{money(result['base_hardware'])}**")
@@ -202,18 +153,7 @@ with right:
     if qty and qty > 1:
         st.metric("Order total (all screens)", money(result["order_total"]))
 
-    data = {
-        "Metric": ["Width (m)", "Height (m)", "Area (m²)", "Cabinets",
-                   "Per-m² base price", "Panels base $", "Controller $",
-                   "RSI Markup %", "RSI Markup $", "Total per screen $",
-                   "Per m² all-in $", "Per cabinet all-in $", "Order qty", "Order total $"],
-        "Value": [f"{result['width_m']:.2f}", f"{result['height_m']:.2f}", f"{result['area_m2']:.2f}", f"{result['cabinets']}",
-                  money(result["base_price_m2"]), money(result["base_hardware"]), money(result["controller_total"]),
-                  f"{result['markup_pct']}%", money(result["markup_amount"]), money(result["grand_total"]),
-                  money(result["per_m2"]), money(result["per_cabinet"]), f"{qty}", money(result["order_total"])]
-    }
-    df = pd.DataFrame(data)
-    st.dataframe(df, use_container_width=True)
+    st.markdown(specs_html(tuple(result.items()), qty), unsafe_allow_html=True)
 
 st.markdown("---")
 st.caption("Use the 'Tiered (linear 1→25)' mode for vendor-based quotes; adjust RSI % to model your client billing margin.")
@@ -0,0 +1,218 @@
+
+# ledcore.py
+# Shared pricing math and grid preview for the LED Video Wall Estimator apps.
+#
+# Every Streamlit entrypoint (led_wall_estimator*.py) imports from here, so the
+# cost model, grid drawing and their caches live in one place.
+
+from functools import lru_cache
+
+import numpy as np
+import streamlit as st
+
+# Cabinet geometry (meters / m²)
+CABINET_W, CABINET_H, AREA_PER_CAB = 0.5, 0.5, 0.25
+
+# -----------------------
+# Pricing
+# -----------------------
+
+def linear_price_per_m2(qty, low_qty=1, low_price=3400.0, high_qty=25, high_price=2720.0):
+    """
+    Returns a per-m² price for a given quantity using linear interpolation
+    between (low_qty, low_price) and (high_qty, high_price).
+    Clamps below/above the endpoints. Accepts a scalar or an array of quantities.
+    """
+    return np.interp(qty, [low_qty, high_qty], [low_price, high_price])
+
+
+def _compute_costs_vec(cols, rows, qty, base_price_m2, controller, markup_pct):
+    """
+    Array form of the per-screen cost math. Every argument may be a scalar or a
+    numpy array (broadcast together), so quantity or size sweeps run in one call.
+    Returns (area_m2, base_hardware, markup_amount, grand_total, per_m2, per_cab, order_total).
+    """
+    cabinets = cols * rows
+    area_m2 = cabinets * AREA_PER_CAB
+    base_hardware = area_m2 * base_price_m2
+    subtotal = base_hardware + controller
+    markup_amount = subtotal * (markup_pct / 100.0)
+    grand_total = subtotal + markup_amount
+    per_m2 = np.where(area_m2 > 0, grand_total / np.where(area_m2 > 0, area_m2, 1), 0.0)
+    per_cab = np.where(cabinets > 0, grand_total / np.where(cabinets > 0, cabinets, 1), 0.0)
+    order_total = grand_total * qty
+    return area_m2, base_hardware, markup_amount, grand_total, per_m2, per_cab, order_total
+
+
+def _costs(cols, rows, qty, base_price_m2, controller_cost, markup_pct, extra_items):
+    cabinets = int(cols * rows)
+
+    # Controller (one per screen)
+    controller_total = controller_cost
+
+    # Extras (line items, per-screen)
+    extras_total = sum(cost for _, cost in extra_items)
+
+    area_m2, base_hardware, markup_amount, grand_total, per_m2, per_cab, order_total = (
+        float(v) for v in _compute_costs_vec(cols, rows, qty, base_price_m2,
+                                             controller_total + extras_total, markup_pct)
+    )
+
+    return {
+        "area_m2": area_m2,
+        "cabinets": cabinets,
+        "width_m": cols * CABINET_W,
+        "height_m": rows * CABINET_H,
+        "base_price_m2": base_price_m2,
+        "base_hardware": base_hardware,
+        "controller_total": controller_total,
+        "extras_total": extras_total,
+        "markup_pct": markup_pct,
+        "markup_amount": markup_amount,
+        "grand_total": grand_total,
+        "per_m2": per_m2,
+        "per_cabinet": per_cab,
+        "order_total": order_total,
+    }
+
+
+@st.cache_data(max_entries=1024)
+def _compute_costs_tiered(cols, rows, qty, controller_cost, markup_pct, extra_items=()):
+    """Costs with the per-m² price taken from the 1→25 quantity tiers."""
+    return _costs(cols, rows, qty, float(linear_price_per_m2(qty)), controller_cost, markup_pct, extra_items)
+
+
+@st.cache_data(max_entries=1024)
+def _compute_costs_custom(cols, rows, qty, custom_price_m2, controller_cost, markup_pct, extra_items=()):
+    """Costs with a fixed, user-entered per-m² price."""
+    return _costs(cols, rows, qty, float(custom_price_m2), controller_cost, markup_pct, extra_items)
+
+
+def compute_costs(cols, rows, qty, price_mode, custom_price_m2, controller_cost, markup_pct, extra_items=()):
+    """
+    Per-screen and per-order costs for a cols x rows wall.
+    markup_pct is applied on top of hardware + controller + extras (the RSI markup,
+    or shipping/duties in the plain estimator). extra_items is a tuple of (label, cost).
+    Dispatches once on price_mode; each variant is cached on only the inputs it uses,
+    so e.g. editing the custom price while in tiered mode stays a cache hit.
+    """
+    if price_mode == "Tiered (linear 1→25)":
+        return _compute_costs_tiered(cols, rows, qty, controller_cost, markup_pct, extra_items)
+    return _compute_costs_custom(cols, rows, qty, custom_price_m2, controller_cost, markup_pct, extra_items)
+
+
+@st.cache_data(max_entries=256)
+def parse_extras(text: str) -> tuple:
+    """
+    Parses 'Label:Cost' lines into a tuple of (label, cost) pairs.
+    Lines without a colon or with a non-numeric cost are skipped.
+    """
+    extras = []
+    for line in text.splitlines():
+        if ":" in line:
+            label, cost = line.split(":", 1)
+            try:
+                extras.append((label.strip(), float(cost.strip())))
+            except ValueError:
+                pass
+    return tuple(extras)
+
+
+_money_fmt = "${:,.0f}".format
+
+
+@lru_cache(maxsize=2048)
+def _money(x: float) -> str:
+    return _money_fmt(x)
+
+
+def money(x: float) -> str:
+    # -0.0 == 0.0 shares a cache key; + 0.0 normalises it so "$-0" can't stick
+    return _money(x + 0.0)
+
+
+# -----------------------
+# Grid preview
+# -----------------------
+
+@st.cache_data(max_entries=256)
+def _grid_spec(cols, rows):
+    """
+    Builds the cabinet grid figure and returns it as a plain dict.
+    Cached on (cols, rows) so unrelated widget changes skip the rebuild.
+    """
+    # Plotly is imported on first use to keep it off the cold-start path
+    import plotly.graph_objects as go
+
+    width_m = cols * CABINET_W
+    height_m = rows * CABINET_H
+
+    fig = go.Figure()
+    # Draw outer rectangle
+    fig.add_shape(type="rect",
+                  x0=0, y0=0, x1=width_m, y1=height_m,
+                  line=dict(width=2))
+
+    # Grid lines (vertical): x, x, NaN per line so one trace draws every segment
+    xs_v = np.repeat(np.arange(1, cols) * CABINET_W, 3)
+    xs_v[2::3] = np.nan
+    ys_v = np.tile([0.0, height_m, np.nan], cols - 1)
+
+    # Grid lines (horizontal)
+    xs_h = np.tile([0.0, width_m, np.nan], rows - 1)
+    ys_h = np.repeat(np.arange(1, rows) * CABINET_H, 3)
+    ys_h[2::3] = np.nan
+
+    fig.add_trace(go.Scattergl(x=np.concatenate([xs_v, xs_h]),
+                               y=np.concatenate([ys_v, ys_h]),
+                               mode="lines",
+                               line=dict(color="#444", width=1),
+                               hoverinfo="skip",
+                               showlegend=False))
+
+    # Labels
+    fig.update_xaxes(range=[-0.05, max(0.5, width_m + 0.05)],
+                     title_text="Width (m)",
+                     showgrid=False,
+                     zeroline=False)
+    fig.update_yaxes(range=[-0.05, max(0.5, height_m + 0.05)],
+                     title_text="Height (m)",
+                     scaleanchor="x",
+                     scaleratio=1,
+                     showgrid=False,
+                     zeroline=False)
+
+    fig.update_layout(
+        margin=dict(l=10, r=10, t=10, b=10),
+        height=420,
+        dragmode=False,
+        uirevision="grid"
+    )
+    return fig.to_dict()
+
+
+def grid_figure(cols, rows):
+    """Draw a simple cabinet grid using Plotly, with 0.5m x 0.5m tiles."""
+    import plotly.graph_objects as go
+
+    return go.Figure(_grid_spec(cols, rows))
+
+
+# -----------------------
+# Per-session memo
+# -----------------------
+
+def estimate(cols, rows, qty, price_mode, custom_price_m2, controller_cost, markup_pct, extra_items=()):
+    """
+    Returns (result, fig) for the current inputs. The last pair is kept in
+    st.session_state, so reruns triggered by unrelated widgets (e.g. the admin
+    key field) skip both the cost lookup and the figure rebuild.
+    """
+    key = (cols, rows, qty, price_mode, custom_price_m2, controller_cost, markup_pct, extra_items)
+    if st.session_state.get("_estimate_key") == key:
+        return st.session_state["_estimate_val"]
+
+    val = (compute_costs(*key), grid_figure(cols, rows))
+    st.session_state["_estimate_key"] = key
+    st.session_state["_estimate_val"] = val
+    return val